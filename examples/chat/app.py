@@ -2,16 +2,27 @@
 DeltaDatabase Chat Application
 A Flask-based chat app that uses DeltaDatabase as its sole storage backend.
 """
+import atexit
+import copy
 import os
 import uuid
 import hashlib
+import hmac
 import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 
+import openai
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import (
     Flask,
+    Response,
     render_template,
     request,
     redirect,
@@ -19,6 +30,9 @@ from flask import (
     session,
     jsonify,
     flash,
+    g,
+    has_request_context,
+    stream_with_context,
 )
 
 app = Flask(__name__)
@@ -36,40 +50,122 @@ DELTA_DB_API_KEY = os.environ.get("DELTA_DB_API_KEY", "")
 # Database / collection names inside DeltaDatabase
 DB_USERS = "chat_users"
 DB_CHATS = "chat_sessions"
+DB_CHAT_MSGS = "chat_messages"
 DB_CHAT_INDEX = "chat_index"
 DB_USER_CONFIG = "chat_user_config"
 DB_ADMIN_CONFIG = "chat_admin_config"
 
 DEFAULT_MODELS = ["gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo"]
 
+# One pooled, keep-alive session shared by every DeltaDatabase call so a page
+# render that issues many sequential lookups reuses the same TCP connections.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.1),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+_session.headers["Authorization"] = f"Bearer {DELTA_DB_API_KEY}"
 
-def _headers() -> dict:
-    return {"Authorization": f"Bearer {DELTA_DB_API_KEY}"}
+# Worker pool used by delta_mget to fan independent lookups out concurrently.
+_fetch_pool = ThreadPoolExecutor(max_workers=16)
 
+# Non-authoritative writes (e.g. chat tombstones) are deferred to this pool so
+# the response does not wait on them; it is drained on shutdown.
+_bg = ThreadPoolExecutor(max_workers=4)
+atexit.register(_bg.shutdown, wait=True)
 
-def delta_get(db: str, key: str):
-    """Return the entity dict or None if not found."""
-    resp = requests.get(
-        f"{DELTA_DB_URL}/entity/{db}",
+
+@lru_cache(maxsize=32)
+def _entity_url(db: str) -> str:
+    return f"{DELTA_DB_URL}/entity/{db}"
+
+
+def _fetch_entity(db: str, key: str):
+    """Fetch a single entity from DeltaDatabase, bypassing the request cache."""
+    resp = _session.get(
+        _entity_url(db),
         params={"key": key},
-        headers=_headers(),
         timeout=10,
     )
     if resp.status_code == 404:
         return None
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
+
+
+def _request_cache():
+    """Return the per-request lookup cache, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.setdefault("_delta_cache", {})
+
+
+def delta_get(db: str, key: str):
+    """Return the entity dict or None if not found.
+
+    Lookups are memoised for the lifetime of the current request, so a page
+    render that asks for the same entity twice only hits DeltaDatabase once.
+    """
+    cache = _request_cache()
+    if cache is not None and (db, key) in cache:
+        return copy.deepcopy(cache[(db, key)])
+    value = _fetch_entity(db, key)
+    if cache is not None:
+        cache[(db, key)] = copy.deepcopy(value)
+    return value
+
+
+def delta_mget(db: str, keys: list) -> dict:
+    """Return ``{key: entity dict or None}`` for every key in *keys*.
+
+    DeltaDatabase has no multi-get endpoint, so lookups that are not already
+    cached for this request are issued concurrently over the pooled session.
+    """
+    cache = _request_cache()
+    result = {}
+    missing = []
+    for key in keys:
+        if cache is not None and (db, key) in cache:
+            result[key] = copy.deepcopy(cache[(db, key)])
+        elif key not in result:
+            result[key] = None
+            missing.append(key)
+    fetched = _fetch_pool.map(lambda k: _fetch_entity(db, k), missing)
+    for key, value in zip(missing, fetched):
+        result[key] = value
+        if cache is not None:
+            cache[(db, key)] = copy.deepcopy(value)
+    return result
 
 
 def delta_put(db: str, key: str, value: dict) -> None:
     """Create or update an entity."""
-    resp = requests.put(
-        f"{DELTA_DB_URL}/entity/{db}",
-        json={key: value},
-        headers=_headers(),
+    resp = _session.put(
+        _entity_url(db),
+        data=orjson.dumps({key: value}),
+        headers={"Content-Type": "application/json"},
         timeout=10,
     )
     resp.raise_for_status()
+    cache = _request_cache()
+    if cache is not None:
+        cache[(db, key)] = copy.deepcopy(value)
+
+
+def delta_delete(db: str, key: str) -> None:
+    """Remove an entity."""
+    resp = _session.delete(
+        _entity_url(db),
+        params={"key": key},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    cache = _request_cache()
+    if cache is not None:
+        cache[(db, key)] = None
 
 
 # ---------------------------------------------------------------------------
@@ -81,13 +177,28 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
-    return secrets.compare_digest(hash_password(password), stored_hash)
+    # Compare the raw 32-byte digests rather than hex-encoding the candidate.
+    try:
+        expected = bytes.fromhex(stored_hash)
+    except ValueError:
+        return False
+    return hmac.compare_digest(hashlib.sha256(password.encode()).digest(), expected)
+
+
+def _load_session_user() -> bool:
+    """Read the logged-in user from the session once and stash it on ``g``."""
+    username = session.get("username")
+    if not username:
+        return False
+    g.username = username
+    g.is_admin = session.get("is_admin", False)
+    return True
 
 
 def login_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        if "username" not in session:
+        if not _load_session_user():
             return redirect(url_for("login"))
         return f(*args, **kwargs)
 
@@ -97,9 +208,9 @@ def login_required(f):
 def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        if "username" not in session:
+        if not _load_session_user():
             return redirect(url_for("login"))
-        if not session.get("is_admin"):
+        if not g.is_admin:
             flash("Admin access required.", "error")
             return redirect(url_for("chat_list"))
         return f(*args, **kwargs)
@@ -111,22 +222,66 @@ def admin_required(f):
 # Admin config helpers
 # ---------------------------------------------------------------------------
 
+# The global admin config changes only through the /admin routes, so it is
+# cached process-wide for a short TTL and refreshed explicitly on mutation.
+_ADMIN_TTL = 30.0
+_admin_cfg = None
+_admin_cfg_ts = 0.0
+_admin_cfg_lock = threading.Lock()
+
+
+def _set_admin_config(config: dict) -> None:
+    global _admin_cfg, _admin_cfg_ts
+    with _admin_cfg_lock:
+        _admin_cfg = copy.deepcopy(config)
+        _admin_cfg_ts = time.monotonic()
+
+
 def get_admin_config() -> dict:
+    with _admin_cfg_lock:
+        if _admin_cfg is not None and time.monotonic() - _admin_cfg_ts < _ADMIN_TTL:
+            return copy.deepcopy(_admin_cfg)
     config = delta_get(DB_ADMIN_CONFIG, "global")
     if config is None:
         config = {"available_models": list(DEFAULT_MODELS), "user_models": {}}
         delta_put(DB_ADMIN_CONFIG, "global", config)
+    _set_admin_config(config)
     return config
 
 
 def get_user_models(username: str) -> list:
-    config = get_admin_config()
+    return _models_from_config(get_admin_config(), username)
+
+
+def _models_from_config(config: dict, username: str) -> list:
     user_specific = config.get("user_models", {}).get(username)
     if user_specific:
         return user_specific
     return config.get("available_models", DEFAULT_MODELS)
 
 
+# ---------------------------------------------------------------------------
+# OpenAI client helpers
+# ---------------------------------------------------------------------------
+
+# Clients are thread-safe and keep their own connection pool, so one is built
+# per (api_key, base_url) pair and reused across requests.
+_openai_clients: dict = {}
+_openai_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str, base_url: str) -> "openai.OpenAI":
+    key = (api_key, base_url)
+    client = _openai_clients.get(key)
+    if client is None:
+        with _openai_clients_lock:
+            client = _openai_clients.get(key)
+            if client is None:
+                client = openai.OpenAI(api_key=api_key, base_url=base_url)
+                _openai_clients[key] = client
+    return client
+
+
 # ---------------------------------------------------------------------------
 # Routes – public
 # ---------------------------------------------------------------------------
@@ -211,7 +366,7 @@ def logout():
 @app.route("/chat")
 @login_required
 def chat_list():
-    username = session["username"]
+    username = g.username
     chats = _load_chat_list(username)
     return render_template("chat.html", chats=chats, current_chat=None, chat_id=None, models=[], user_config={})
 
@@ -219,14 +374,14 @@ def chat_list():
 @app.route("/chat/new", methods=["POST"])
 @login_required
 def new_chat():
-    username = session["username"]
+    username = g.username
     chat_id = uuid.uuid4().hex[:10]
     now = datetime.utcnow().isoformat()
     chat_data = {
         "username": username,
         "id": chat_id,
         "title": "New Chat",
-        "messages": [],
+        "next_seq": 0,
         "created_at": now,
         "updated_at": now,
     }
@@ -240,18 +395,19 @@ def new_chat():
 @app.route("/chat/<chat_id>")
 @login_required
 def chat_view(chat_id: str):
-    username = session["username"]
+    username = g.username
     chat_data = _get_own_chat(username, chat_id)
     if chat_data is None:
         flash("Chat not found.", "error")
         return redirect(url_for("chat_list"))
+    messages = _load_messages(username, chat_id, chat_data)
     chats = _load_chat_list(username)
     models = get_user_models(username)
     user_config = delta_get(DB_USER_CONFIG, username) or {}
     return render_template(
         "chat.html",
         chats=chats,
-        current_chat=chat_data,
+        current_chat=dict(chat_data, messages=messages),
         chat_id=chat_id,
         models=models,
         user_config=user_config,
@@ -261,7 +417,7 @@ def chat_view(chat_id: str):
 @app.route("/chat/<chat_id>/message", methods=["POST"])
 @login_required
 def send_message(chat_id: str):
-    username = session["username"]
+    username = g.username
     data = request.get_json() or {}
     user_message = (data.get("message") or "").strip()
     model = data.get("model", "gpt-4o-mini")
@@ -269,65 +425,89 @@ def send_message(chat_id: str):
     if not user_message:
         return jsonify({"error": "Message cannot be empty."}), 400
 
-    allowed = get_user_models(username)
+    # The chat, the user's config and the admin config are independent, so
+    # fetch them concurrently instead of paying three sequential round-trips.
+    fut_chat = _fetch_pool.submit(_get_own_chat, username, chat_id)
+    fut_cfg = _fetch_pool.submit(delta_get, DB_USER_CONFIG, username)
+    fut_admin = _fetch_pool.submit(get_admin_config)
+    chat_data = fut_chat.result()
+    user_config = fut_cfg.result() or {}
+    allowed = _models_from_config(fut_admin.result(), username)
     if model not in allowed:
         model = allowed[0] if allowed else "gpt-4o-mini"
 
-    chat_data = _get_own_chat(username, chat_id)
     if chat_data is None:
         return jsonify({"error": "Chat not found."}), 404
 
-    user_config = delta_get(DB_USER_CONFIG, username) or {}
     api_key = user_config.get("openai_api_key") or os.environ.get("OPENAI_API_KEY", "")
     base_url = user_config.get("openai_base_url") or "https://api.openai.com/v1"
 
+    user_turn = {"role": "user", "content": user_message}
+
     # Support mock mode for testing without a real API key
     if os.environ.get("MOCK_OPENAI") == "true":
-        assistant_message = f"[mock] You said: {user_message}"
+        # The reply needs no history; only migrate a legacy inline chat so the
+        # new turn lands after its existing messages.
+        if "messages" in chat_data:
+            _load_messages(username, chat_id, chat_data)
+        chunks = iter([f"[mock] You said: {user_message}"])
     else:
         if not api_key:
             return jsonify({"error": "No OpenAI API key configured. Please add one in Settings."}), 400
         try:
-            import openai
-            client = openai.OpenAI(api_key=api_key, base_url=base_url)
-            messages = chat_data.get("messages", [])
-            messages.append({"role": "user", "content": user_message})
-            response = client.chat.completions.create(model=model, messages=messages)
-            assistant_message = response.choices[0].message.content
+            client = get_openai_client(api_key, base_url)
+            messages = _load_messages(username, chat_id, chat_data) + [user_turn]
+            response = client.chat.completions.create(model=model, messages=messages, stream=True)
         except Exception as exc:
             return jsonify({"error": str(exc)}), 500
-
-    messages = chat_data.get("messages", [])
-    messages.append({"role": "user", "content": user_message})
-    messages.append({"role": "assistant", "content": assistant_message})
+        chunks = (
+            chunk.choices[0].delta.content
+            for chunk in response
+            if chunk.choices and chunk.choices[0].delta.content
+        )
 
     # Auto-title from first user turn
     if chat_data.get("title") == "New Chat":
         chat_data["title"] = (user_message[:50] + "…") if len(user_message) > 50 else user_message
 
-    now = datetime.utcnow().isoformat()
-    chat_data["messages"] = messages
-    chat_data["updated_at"] = now
-    delta_put(DB_CHATS, f"{username}__{chat_id}", chat_data)
+    # Persist the user turn before streaming so it survives a failed model
+    # call or a client that disconnects before reading the response.
+    chat_data["updated_at"] = datetime.utcnow().isoformat()
+    _append_messages(username, chat_id, chat_data, [user_turn])
+
+    def generate():
+        parts = []
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield _sse({"delta": text})
+        except Exception as exc:
+            yield _sse({"error": str(exc)})
+            return
+        # Only a completed reply is stored; a failed or abandoned stream
+        # leaves the user turn without an answer.
+        chat_data["updated_at"] = datetime.utcnow().isoformat()
+        _append_messages(
+            username,
+            chat_id,
+            chat_data,
+            [{"role": "assistant", "content": "".join(parts)}],
+        )
+        yield _sse({"done": True, "title": chat_data["title"]})
 
-    return jsonify({"reply": assistant_message, "title": chat_data["title"]})
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
 
 
 @app.route("/chat/<chat_id>/delete", methods=["POST"])
 @login_required
 def delete_chat(chat_id: str):
-    username = session["username"]
+    username = g.username
     idx = delta_get(DB_CHAT_INDEX, username) or {"chats": []}
     idx["chats"] = [c for c in idx["chats"] if c != chat_id]
     delta_put(DB_CHAT_INDEX, username, idx)
-    # Overwrite with a tombstone so the key is gone from active chats
-    now = datetime.utcnow().isoformat()
-    delta_put(
-        DB_CHATS,
-        f"{username}__{chat_id}",
-        {"username": username, "id": chat_id, "deleted": True,
-         "title": "", "messages": [], "created_at": now, "updated_at": now},
-    )
+    # The index update above is authoritative, so purging the stored messages
+    # and tombstoning the header happens off-request.
+    _bg.submit(_purge_chat, username, chat_id).add_done_callback(_report_bg_failure)
     return jsonify({"status": "ok"})
 
 
@@ -338,7 +518,7 @@ def delete_chat(chat_id: str):
 @app.route("/settings", methods=["GET", "POST"])
 @login_required
 def settings():
-    username = session["username"]
+    username = g.username
     if request.method == "POST":
         api_key = request.form.get("openai_api_key", "").strip()
         base_url = (request.form.get("openai_base_url") or "https://api.openai.com/v1").strip()
@@ -370,9 +550,9 @@ def settings():
 @admin_required
 def admin():
     idx = delta_get(DB_ADMIN_CONFIG, "users_index") or {"users": []}
+    user_records = delta_mget(DB_USERS, idx.get("users", []))
     users = []
-    for uname in idx.get("users", []):
-        udata = delta_get(DB_USERS, uname)
+    for uname, udata in user_records.items():
         if udata:
             users.append(
                 {
@@ -398,6 +578,7 @@ def admin_user_models(username: str):
     config = get_admin_config()
     config.setdefault("user_models", {})[username] = models
     delta_put(DB_ADMIN_CONFIG, "global", config)
+    _set_admin_config(config)
     return jsonify({"status": "ok"})
 
 
@@ -409,6 +590,7 @@ def admin_available_models():
     config = get_admin_config()
     config["available_models"] = models
     delta_put(DB_ADMIN_CONFIG, "global", config)
+    _set_admin_config(config)
     return jsonify({"status": "ok"})
 
 
@@ -418,9 +600,11 @@ def admin_available_models():
 
 def _load_chat_list(username: str) -> list:
     idx = delta_get(DB_CHAT_INDEX, username) or {"chats": []}
+    chat_ids = idx.get("chats", [])
+    records = delta_mget(DB_CHATS, [f"{username}__{cid}" for cid in chat_ids])
     chats = []
-    for cid in idx.get("chats", []):
-        cd = delta_get(DB_CHATS, f"{username}__{cid}")
+    for cid in chat_ids:
+        cd = records.get(f"{username}__{cid}")
         if cd and not cd.get("deleted"):
             chats.append(
                 {
@@ -433,6 +617,71 @@ def _load_chat_list(username: str) -> list:
     return chats
 
 
+def _report_bg_failure(future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        print(f"[chat-app] Warning – background write failed: {exc}")
+
+
+def _message_key(username: str, chat_id: str, seq: int) -> str:
+    return f"{username}__{chat_id}__{seq:06d}"
+
+
+def _append_messages(username: str, chat_id: str, chat_data: dict, new_messages: list) -> None:
+    """Append *new_messages* to the chat's log and persist the updated header.
+
+    Each message is its own DB_CHAT_MSGS entity, so a turn writes only the new
+    messages plus the small header instead of the whole history.
+    """
+    seq = chat_data.get("next_seq", 0)
+    for msg in new_messages:
+        delta_put(DB_CHAT_MSGS, _message_key(username, chat_id, seq), msg)
+        seq += 1
+    chat_data["next_seq"] = seq
+    delta_put(DB_CHATS, f"{username}__{chat_id}", chat_data)
+
+
+def _purge_chat(username: str, chat_id: str) -> None:
+    """Delete every stored message of a chat, then overwrite it with a tombstone.
+
+    Messages go first so that a failed purge leaves the header's ``next_seq``
+    intact and deleting the chat again retries the remaining keys.
+    """
+    chat_data = _get_own_chat(username, chat_id)
+    if chat_data is None:
+        return
+    keys = [_message_key(username, chat_id, seq) for seq in range(chat_data.get("next_seq", 0))]
+    list(_fetch_pool.map(lambda k: delta_delete(DB_CHAT_MSGS, k), keys))
+    now = datetime.utcnow().isoformat()
+    delta_put(
+        DB_CHATS,
+        f"{username}__{chat_id}",
+        {"username": username, "id": chat_id, "deleted": True,
+         "title": "", "next_seq": 0, "created_at": now, "updated_at": now},
+    )
+
+
+def _load_messages(username: str, chat_id: str, chat_data: dict) -> list:
+    """Return the chat's messages in order.
+
+    Chats stored before the message log existed keep their history inline
+    under ``messages``; those are migrated into the log on first load.
+    """
+    legacy = chat_data.pop("messages", None)
+    if legacy is not None:
+        chat_data["next_seq"] = 0
+        _append_messages(username, chat_id, chat_data, legacy)
+        return list(legacy)
+    keys = [_message_key(username, chat_id, seq) for seq in range(chat_data.get("next_seq", 0))]
+    records = delta_mget(DB_CHAT_MSGS, keys)
+    return [records[k] for k in keys if records[k] is not None]
+
+
+def _sse(payload: dict) -> bytes:
+    """Format *payload* as a single server-sent event."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
 def _get_own_chat(username: str, chat_id: str):
     """Return chat data only if it belongs to the given user, else None."""
     cd = delta_get(DB_CHATS, f"{username}__{chat_id}")
@@ -31,7 +31,7 @@
   // ── Append a message bubble ───────────────────────────────────
   function appendMessage(role, content) {
     const msgs = document.getElementById("messages");
-    if (!msgs) return;
+    if (!msgs) return null;
     const wrapper = document.createElement("div");
     wrapper.className = `message message--${role}`;
     wrapper.innerHTML = `
@@ -39,6 +39,7 @@
       <div class="message-content">${escapeHtml(content)}</div>`;
     msgs.appendChild(wrapper);
     scrollToBottom();
+    return wrapper.querySelector(".message-content");
   }
 
   function escapeHtml(str) {
@@ -79,18 +80,41 @@
           }),
         });
 
-        const data = await res.json();
-
         if (!res.ok) {
+          const data = await res.json();
           appendMessage("assistant", `⚠ Error: ${data.error || res.statusText}`);
-        } else {
-          appendMessage("assistant", data.reply);
-          // Update sidebar title + page header if title changed
-          if (data.title) {
-            const sidebarTitle = document.getElementById(`title-${chatId}`);
-            if (sidebarTitle) sidebarTitle.textContent = data.title;
-            const headerTitle = document.getElementById("chat-header-title");
-            if (headerTitle) headerTitle.textContent = data.title;
+          return;
+        }
+
+        // The reply is streamed as server-sent events: {delta} chunks,
+        // then a final {done, title} event (or {error}).
+        const bubble = appendMessage("assistant", "");
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let reply = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const events = buffer.split("\n\n");
+          buffer = events.pop();
+          for (const evt of events) {
+            if (!evt.startsWith("data: ")) continue;
+            const data = JSON.parse(evt.slice(6));
+            if (data.delta) {
+              reply += data.delta;
+              bubble.textContent = reply;
+              scrollToBottom();
+            } else if (data.error) {
+              bubble.textContent = `⚠ Error: ${data.error}`;
+            } else if (data.done && data.title) {
+              // Update sidebar title + page header if title changed
+              const sidebarTitle = document.getElementById(`title-${chatId}`);
+              if (sidebarTitle) sidebarTitle.textContent = data.title;
+              const headerTitle = document.getElementById("chat-header-title");
+              if (headerTitle) headerTitle.textContent = data.title;
+            }
           }
         }
       } catch (err) {
@@ -1,15 +1,24 @@
 import base64
+import hashlib
+import http.client
 import json
 import os
 import socket
 import subprocess
+import sys
+import tempfile
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import grpc
+import orjson
+import pybase64
 import pytest
 import requests as _requests
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
@@ -38,35 +47,106 @@ def pytest_addoption(parser):
     )
 
 
+def pytest_configure(config):
+    # Registered here so the mark is known even without pytest-xdist.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run these tests on one xdist worker"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Keep every case of a parametrized test on one xdist worker (with
+    # --dist=loadgroup) so the cases share that worker's session fixtures
+    # and pooled connections instead of being scattered across workers.
+    for item in items:
+        if getattr(item, "callspec", None) is None:
+            continue
+        if item.get_closest_marker("xdist_group") is None:
+            item.add_marker(pytest.mark.xdist_group(
+                f"{item.module.__name__}::{item.originalname}"))
+
+
 def _free_port():
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(("127.0.0.1", 0))
         return s.getsockname()[1]
 
 
+def _go_source_hash():
+    """Hash every Go source plus go.mod/go.sum so binaries rebuild on change."""
+    h = hashlib.sha256()
+    files = [REPO_ROOT / "go.mod", REPO_ROOT / "go.sum"]
+    for sub in ("api", "cmd", "internal", "pkg"):
+        files.extend(sorted((REPO_ROOT / sub).rglob("*.go")))
+    for path in files:
+        if path.is_file():
+            h.update(str(path.relative_to(REPO_ROOT)).encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _go_binary(package):
+    """Return the path of a compiled ``./cmd/<package>`` binary.
+
+    Binaries are cached under the system temp dir keyed on a hash of the Go
+    sources, so repeated test sessions skip the compile+link that ``go run``
+    pays on every start.
+    """
+    suffix = ".exe" if sys.platform == "win32" else ""
+    bin_dir = Path(tempfile.gettempdir()) / "deltadb-bin" / _go_source_hash()
+    bin_path = bin_dir / f"{package}{suffix}"
+    if not bin_path.exists():
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = bin_dir / f".{package}.{os.getpid()}{suffix}"
+        subprocess.run(
+            ["go", "build", "-o", str(tmp_path), f"./cmd/{package}"],
+            cwd=str(REPO_ROOT),
+            check=True,
+        )
+        os.replace(tmp_path, bin_path)
+    return bin_path
+
+
 def _wait_for_http(url, timeout=60.0):
+    # Poll with exponential backoff (10 ms → 200 ms) so a fast-starting server
+    # is detected almost immediately.  http.client keeps each probe cheap.
+    parts = urlsplit(url)
     deadline = time.monotonic() + timeout
+    delay = 0.01
     while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=0.25)
         try:
-            r = _requests.get(url, timeout=1)
-            if r.status_code == 200:
+            conn.request("GET", parts.path or "/")
+            if conn.getresponse().status == 200:
                 return True
-        except _requests.RequestException:
+        except OSError:
             pass
-        time.sleep(0.3)
+        finally:
+            conn.close()
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.2)
     return False
 
 
-def _wait_for_port(host, port, timeout=30.0):
+_LISTENING_MARKER = b"gRPC server listening on"
+
+
+def _tee_output(proc, log_fp, marker, event):
+    """Copy *proc*'s output into *log_fp*, setting *event* once *marker* appears."""
+    for line in proc.stdout:
+        log_fp.write(line)
+        log_fp.flush()
+        if not event.is_set() and marker in line:
+            event.set()
+
+
+def _wait_for_output(event, proc, timeout):
+    """Wait for *event*, giving up early if *proc* exits first."""
     deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        try:
-            with socket.create_connection((host, port), timeout=0.5):
-                return True
-        except OSError:
-            pass
-        time.sleep(0.2)
-    return False
+    while not event.wait(0.05):
+        if proc.poll() is not None or time.monotonic() >= deadline:
+            return event.is_set()
+    return True
 
 
 @pytest.fixture(scope="session")
@@ -74,7 +154,7 @@ def live_server(tmp_path_factory):
     # ── External deployment mode ─────────────────────────────────────────────
     # When DELTADB_EXTERNAL_URL is set the test suite connects to an already-
     # running deployment (e.g. the Docker container started by the CI workflow)
-    # instead of spawning local workers via `go run`.
+    # instead of spawning locally built workers.
     #
     # Supported environment variables:
     #   DELTADB_EXTERNAL_URL           REST base URL, e.g. http://127.0.0.1:18080
@@ -133,7 +213,13 @@ def live_server(tmp_path_factory):
         }
         return  # nothing to tear down — the container is managed by CI
 
-    # ── Local mode: spawn workers using go run ────────────────────────────────
+    # ── Local mode: spawn prebuilt worker binaries ────────────────────────────
+    try:
+        main_bin = _go_binary("main-worker")
+        proc_bin = _go_binary("proc-worker")
+    except (OSError, subprocess.CalledProcessError) as exc:
+        pytest.fail(f"Failed to build worker binaries: {exc}")
+
     root = tmp_path_factory.mktemp("live_shared_fs")
     db_dir = root / "db"
     (db_dir / "files").mkdir(parents=True, exist_ok=True)
@@ -149,45 +235,82 @@ def live_server(tmp_path_factory):
     proc_grpc_addr = f"127.0.0.1:{proc_grpc_port}"
 
     log_file = root / "server.log"
-    log_fp = open(log_file, "w")  # noqa: SIM115
+    log_fp = open(log_file, "wb")  # noqa: SIM115
 
+    # Both workers log "gRPC server listening on ..." right after binding, so
+    # their output is tee'd into the log file and watched for that line
+    # instead of polling the ports.
     main_proc = subprocess.Popen(
         [
-            "go", "run", "./cmd/main-worker",
+            str(main_bin),
             f"-grpc-addr={main_grpc_addr}",
             f"-rest-addr={main_rest_addr}",
             f"-shared-fs={db_dir}",
             "-admin-key=test-admin-key",
         ],
         cwd=str(REPO_ROOT),
-        stdout=log_fp,
-        stderr=log_fp,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    main_listening = threading.Event()
+    main_tee = threading.Thread(
+        target=_tee_output,
+        args=(main_proc, log_fp, _LISTENING_MARKER, main_listening),
+        daemon=True,
     )
+    main_tee.start()
 
-    if not _wait_for_http(rest_url + "/health", timeout=120):
+    # proc-worker only needs main-worker's gRPC listener to subscribe, so
+    # start it as soon as that is up and overlap the remaining readiness
+    # checks of both workers.
+    if not _wait_for_output(main_listening, main_proc, timeout=120):
         main_proc.terminate()
+        main_tee.join(timeout=5)
         log_fp.close()
         pytest.fail(f"main-worker did not start in time. See {log_file}")
 
     proc_proc = subprocess.Popen(
         [
-            "go", "run", "./cmd/proc-worker",
+            str(proc_bin),
             f"-main-addr={main_grpc_addr}",
             "-worker-id=session-proc-1",
             f"-grpc-addr={proc_grpc_addr}",
             f"-shared-fs={db_dir}",
         ],
         cwd=str(REPO_ROOT),
-        stdout=log_fp,
-        stderr=log_fp,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
     )
-
-    host, port_str = proc_grpc_addr.split(":")
-    if not _wait_for_port(host, int(port_str), timeout=60):
-        proc_proc.terminate()
-        main_proc.terminate()
+    proc_listening = threading.Event()
+    proc_tee = threading.Thread(
+        target=_tee_output,
+        args=(proc_proc, log_fp, _LISTENING_MARKER, proc_listening),
+        daemon=True,
+    )
+    proc_tee.start()
+
+    def _stop_workers():
+        for proc in (proc_proc, main_proc):
+            proc.terminate()
+        for proc in (proc_proc, main_proc):
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        proc_tee.join(timeout=5)
+        main_tee.join(timeout=5)
         log_fp.close()
-        pytest.fail(f"proc-worker did not start in time. See {log_file}")
+
+    # The REST server logs its address just before binding, so /health is
+    # still probed; by now it answers on the first or second attempt.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        main_ready = pool.submit(_wait_for_http, rest_url + "/health", 120)
+        proc_ready = pool.submit(_wait_for_output, proc_listening, proc_proc, 60)
+        main_ok, proc_ok = main_ready.result(), proc_ready.result()
+    if not (main_ok and proc_ok):
+        _stop_workers()
+        which = "main-worker" if not main_ok else "proc-worker"
+        pytest.fail(f"{which} did not start in time. See {log_file}")
 
     try:
         r = _requests.post(
@@ -197,9 +320,7 @@ def live_server(tmp_path_factory):
         )
         token = r.json()["token"]
     except Exception as exc:  # noqa: BLE001
-        proc_proc.terminate()
-        main_proc.terminate()
-        log_fp.close()
+        _stop_workers()
         pytest.fail(f"Failed to obtain client token: {exc}")
 
     yield {
@@ -213,17 +334,63 @@ def live_server(tmp_path_factory):
         "log_path": str(log_file),
     }
 
-    proc_proc.terminate()
-    main_proc.terminate()
-    try:
-        proc_proc.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        proc_proc.kill()
+    _stop_workers()
+
+
+@pytest.fixture(scope="session")
+def short_ttl_server(tmp_path_factory):
+    """A second main-worker issuing 1-second worker tokens, for expiry tests.
+
+    It reuses the cached ``main-worker`` binary, so starting it costs a process
+    launch rather than a ``go run`` compile.
+    """
     try:
-        main_proc.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        main_proc.kill()
-    log_fp.close()
+        main_bin = _go_binary("main-worker")
+    except (OSError, subprocess.CalledProcessError) as exc:
+        pytest.skip(f"main-worker binary unavailable: {exc}")
+
+    root = tmp_path_factory.mktemp("short_ttl")
+    grpc_addr = f"127.0.0.1:{_free_port()}"
+    rest_addr = f"127.0.0.1:{_free_port()}"
+    log_file = root / "server.log"
+    log_fp = open(log_file, "wb")  # noqa: SIM115
+
+    proc = subprocess.Popen(
+        [
+            str(main_bin),
+            f"-grpc-addr={grpc_addr}",
+            f"-rest-addr={rest_addr}",
+            f"-shared-fs={root / 'db'}",
+            "-worker-ttl=1s",
+        ],
+        cwd=str(REPO_ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    listening = threading.Event()
+    tee = threading.Thread(
+        target=_tee_output,
+        args=(proc, log_fp, _LISTENING_MARKER, listening),
+        daemon=True,
+    )
+    tee.start()
+
+    def _stop():
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        tee.join(timeout=5)
+        log_fp.close()
+
+    if not _wait_for_output(listening, proc, timeout=60):
+        _stop()
+        pytest.skip(f"Short-TTL server did not start in time. See {log_file}")
+
+    yield {"grpc_addr": grpc_addr, "log_path": str(log_file)}
+
+    _stop()
 
 
 @pytest.fixture(scope="session")
@@ -239,6 +406,65 @@ def settings(pytestconfig, live_server):
     }
 
 
+# (connect, read) timeout for REST calls: a local server accepts in well under
+# 200 ms, so a stuck connect fails fast instead of eating the read budget.
+_REST_TIMEOUT = (0.2, 2.0)
+
+
+ChatdbEndpoints = namedtuple("ChatdbEndpoints", "put_url get_url headers timeout")
+
+
+@pytest.fixture(scope="session")
+def chatdb_endpoints(settings):
+    """Pre-built ``chatdb`` REST URLs, auth header and timeout for hot request loops.
+
+    ``get_url`` is a format string taking the entity key.
+    """
+    base = settings["rest_url"].rstrip("/")
+    return ChatdbEndpoints(
+        put_url=base + "/entity/chatdb",
+        get_url=base + "/entity/chatdb?key={}",
+        headers={"Authorization": f"Bearer {settings['token']}"},
+        timeout=_REST_TIMEOUT,
+    )
+
+
+FrontendEndpoints = namedtuple(
+    "FrontendEndpoints", "users user_chats chats headers timeout")
+
+
+@pytest.fixture(scope="session")
+def frontend_endpoints(settings):
+    """Pre-built entity URLs, auth header and timeout for the chat-frontend databases.
+
+    Each URL is the PUT target; append ``?key=...`` for a GET.
+    """
+    base = settings["rest_url"].rstrip("/") + "/entity/"
+    return FrontendEndpoints(
+        users=base + "users",
+        user_chats=base + "user_chats",
+        chats=base + "chats",
+        headers={"Authorization": f"Bearer {settings['token']}"},
+        timeout=_REST_TIMEOUT,
+    )
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Keep-alive ``requests.Session`` shared by REST tests.
+
+    Reusing pooled connections avoids a TCP handshake per request in the
+    large parametrized suites.  The pool is sized for the 32-thread
+    concurrent benchmarks so no thread has to open a throwaway connection.
+    No credentials are attached; callers pass ``Authorization`` per request.
+    """
+    session = _requests.Session()
+    session.mount("http://", _requests.adapters.HTTPAdapter(
+        pool_connections=4, pool_maxsize=64, max_retries=0))
+    yield session
+    session.close()
+
+
 @pytest.fixture(scope="session")
 def shared_fs(live_server):
     root = live_server["shared_root"]
@@ -277,13 +503,29 @@ def sample_schema(shared_fs):
     return schema_path
 
 
+@pytest.fixture(scope="session")
+def schema_validator(sample_schema):
+    """Compiled validator for the ``chat.v1`` sample schema, built once.
+
+    Calling it returns the payload when valid and raises
+    ``fastjsonschema.JsonSchemaException`` otherwise.
+    """
+    import fastjsonschema
+
+    return fastjsonschema.compile(json.loads(sample_schema.read_text(encoding="utf-8")))
+
+
 @pytest.fixture(scope="session")
 def aesgcm_key():
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
     return AESGCM.generate_key(bit_length=256)
 
 
 @pytest.fixture(scope="session")
 def aesgcm(aesgcm_key):
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
     return AESGCM(aesgcm_key)
 
 
@@ -295,49 +537,89 @@ def aesgcm(aesgcm_key):
 # here so Python and Go agree on the wire format.
 # ---------------------------------------------------------------------------
 
+# pybase64's SIMD codec only pays off past its call overhead; short fields
+# (tokens, small keys) stay on the stdlib implementation.
+_SIMD_B64_MIN = 256
+
+
+def _b64encode(v) -> str:
+    if len(v) >= _SIMD_B64_MIN:
+        return pybase64.b64encode_as_string(v)
+    return base64.b64encode(v).decode("ascii")
+
+
+def _b64decode(v):
+    if not isinstance(v, str):
+        return v
+    if len(v) >= _SIMD_B64_MIN:
+        return pybase64.b64decode(v, validate=False)
+    return base64.b64decode(v)
+
+
+def _identity(v):
+    return v
+
+
 class _Msg:
-    """Minimal gRPC message base: keyword-constructor + attribute access."""
+    """Minimal gRPC message base: keyword-constructor + attribute access.
+
+    Subclasses declare their wire fields as annotations (``str``, ``bytes`` or
+    ``dict``) together with matching ``__slots__``.  The per-field encoder and
+    decoder plans are computed once per class, so ``_to_wire``/``_from_wire``
+    are straight loops with no per-call type dispatch.
+    """
+
+    __slots__ = ()
 
     _bytes_fields: frozenset = frozenset()
+    _encoders: tuple = ()
+    _decoders: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = cls.__dict__.get("__annotations__", {})
+        cls._bytes_fields = frozenset(
+            name for name, kind in fields.items() if kind is bytes)
+        cls._encoders = tuple(
+            (name, _b64encode if kind is bytes else _identity)
+            for name, kind in fields.items()
+        )
+        cls._decoders = tuple(
+            (name, kind, _b64decode if kind is bytes else _identity)
+            for name, kind in fields.items()
+        )
 
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
 
     def _to_wire(self) -> dict:
-        """Convert to a JSON-serialisable dict (base64-encodes bytes fields)."""
+        """Convert to a JSON-serialisable dict (base64-encodes bytes fields).
+
+        Empty and ``None`` values are omitted, mirroring Go's ``omitempty``.
+        """
         d = {}
-        for k, v in self.__dict__.items():
-            if v is None:
-                continue
-            if k in self._bytes_fields and isinstance(v, (bytes, bytearray)):
-                if v:  # omit empty bytes (omitempty)
-                    d[k] = base64.b64encode(v).decode("ascii")
-            elif isinstance(v, str) and v:
-                d[k] = v
-            elif isinstance(v, dict) and v:
-                d[k] = v
-            elif not isinstance(v, (str, bytes, bytearray, dict)):
-                d[k] = v
+        for name, encode in self._encoders:
+            v = getattr(self, name)
+            if v:
+                d[name] = encode(v)
         return d
 
     @classmethod
     def _from_wire(cls, d: dict):
         obj = cls.__new__(cls)
-        for k, v in d.items():
-            if k in cls._bytes_fields and isinstance(v, str):
-                setattr(obj, k, base64.b64decode(v))
-            else:
-                setattr(obj, k, v)
-        # Ensure bytes fields default to b"" if missing
-        for f in cls._bytes_fields:
-            if not hasattr(obj, f):
-                setattr(obj, f, b"")
+        for name, kind, decode in cls._decoders:
+            v = d.get(name)
+            # Fields omitted on the wire default to their empty value.
+            setattr(obj, name, kind() if v is None else decode(v))
         return obj
 
 
 class SubscribeRequest(_Msg):
-    _bytes_fields = frozenset(["pubkey"])
+    __slots__ = ("worker_id", "pubkey", "tags")
+    worker_id: str
+    pubkey: bytes
+    tags: dict
 
     def __init__(self, worker_id: str = "", pubkey: bytes = b"",
                  tags: dict = None):
@@ -347,7 +629,10 @@ class SubscribeRequest(_Msg):
 
 
 class SubscribeResponse(_Msg):
-    _bytes_fields = frozenset(["wrapped_key"])
+    __slots__ = ("token", "wrapped_key", "key_id")
+    token: str
+    wrapped_key: bytes
+    key_id: str
 
     def __init__(self, token: str = "", wrapped_key: bytes = b"",
                  key_id: str = ""):
@@ -357,7 +642,12 @@ class SubscribeResponse(_Msg):
 
 
 class ProcessRequest(_Msg):
-    _bytes_fields = frozenset(["payload"])
+    __slots__ = ("schema_id", "entity_key", "operation", "payload", "token")
+    schema_id: str
+    entity_key: str
+    operation: str
+    payload: bytes
+    token: str
 
     def __init__(self, schema_id: str = "", entity_key: str = "",
                  operation: str = "", payload: bytes = b"", token: str = "",
@@ -374,7 +664,11 @@ class ProcessRequest(_Msg):
 
 
 class ProcessResponse(_Msg):
-    _bytes_fields = frozenset(["result"])
+    __slots__ = ("status", "result", "version", "error")
+    status: str
+    result: bytes
+    version: str
+    error: str
 
     def __init__(self, status: str = "", result: bytes = b"",
                  version: str = "", error: str = ""):
@@ -385,15 +679,15 @@ class ProcessResponse(_Msg):
 
 
 def _serialize(msg: _Msg) -> bytes:
-    return json.dumps(msg._to_wire()).encode("utf-8")
+    return orjson.dumps(msg._to_wire())
 
 
 def _deserialize_subscribe(data: bytes) -> SubscribeResponse:
-    return SubscribeResponse._from_wire(json.loads(data.decode("utf-8")))
+    return SubscribeResponse._from_wire(orjson.loads(data))
 
 
 def _deserialize_process(data: bytes) -> ProcessResponse:
-    return ProcessResponse._from_wire(json.loads(data.decode("utf-8")))
+    return ProcessResponse._from_wire(orjson.loads(data))
 
 
 class _DeltaDBStub:
@@ -440,13 +734,40 @@ def proto_modules():
     return _PseudoPb2(), _PseudoPb2Grpc()
 
 
+_RSA_KEY_CACHE = Path.home() / ".cache" / "deltadb-tests" / "rsa_priv.pem"
+
+
 @pytest.fixture(scope="session")
 def rsa_key_pair():
-    from cryptography.hazmat.backends import default_backend
+    """RSA-2048 key pair for Subscribe calls, persisted across test runs.
+
+    Tests only need *some* valid public key, so the private key is generated
+    once and cached on disk to skip keygen on every session.
+    """
     from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.primitives.asymmetric import rsa
 
-    private_key = rsa.generate_private_key(65537, 2048, default_backend())
+    private_key = None
+    if _RSA_KEY_CACHE.is_file():
+        try:
+            private_key = serialization.load_pem_private_key(
+                _RSA_KEY_CACHE.read_bytes(), password=None)
+        except ValueError:
+            private_key = None
+    if private_key is None:
+        private_key = rsa.generate_private_key(65537, 2048)
+        try:
+            _RSA_KEY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = _RSA_KEY_CACHE.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ))
+            tmp_path.chmod(0o600)
+            os.replace(tmp_path, _RSA_KEY_CACHE)
+        except OSError:
+            pass  # caching is best-effort; the fresh key is still usable
     pub_pem = private_key.public_key().public_bytes(
         serialization.Encoding.PEM,
         serialization.PublicFormat.SubjectPublicKeyInfo,
@@ -454,11 +775,38 @@ def rsa_key_pair():
     return {"private_key": private_key, "pub_pem": pub_pem}
 
 
+# Session-long channels are kept warm with HTTP/2 keepalive pings so idle
+# stretches between tests do not force a fresh handshake.  Tests assert on
+# the first status an RPC returns, so client-side retries are switched off.
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.enable_retries", 0),
+]
+
+
 @pytest.fixture(scope="session")
-def grpc_token(proto_modules, live_server, rsa_key_pair):
+def _main_channel(live_server):
+    """Single gRPC channel to main-worker shared by every session fixture."""
+    channel = grpc.insecure_channel(live_server["grpc_addr"],
+                                    options=_GRPC_CHANNEL_OPTIONS)
+    yield channel
+    channel.close()
+
+
+@pytest.fixture(scope="session")
+def _proc_channel(live_server):
+    """Single gRPC channel to proc-worker shared by every session fixture."""
+    channel = grpc.insecure_channel(live_server["proc_grpc_addr"],
+                                    options=_GRPC_CHANNEL_OPTIONS)
+    yield channel
+    channel.close()
+
+
+@pytest.fixture(scope="session")
+def grpc_token(proto_modules, _main_channel, rsa_key_pair):
     pb2, pb2_grpc = proto_modules
-    channel = grpc.insecure_channel(live_server["grpc_addr"])
-    stub = pb2_grpc.MainWorkerStub(channel)
+    stub = pb2_grpc.MainWorkerStub(_main_channel)
     resp = stub.Subscribe(pb2.SubscribeRequest(
         worker_id="token-provider-fixture",
         pubkey=rsa_key_pair["pub_pem"],
@@ -467,15 +815,12 @@ def grpc_token(proto_modules, live_server, rsa_key_pair):
 
 
 @pytest.fixture(scope="session")
-def proc_grpc_stub(proto_modules, live_server):
+def proc_grpc_stub(proto_modules, _proc_channel):
     pb2, pb2_grpc = proto_modules
-    channel = grpc.insecure_channel(live_server["proc_grpc_addr"])
-    return pb2, pb2_grpc.MainWorkerStub(channel)
+    return pb2, pb2_grpc.MainWorkerStub(_proc_channel)
 
 
 @pytest.fixture(scope="session")
-def grpc_stub(proto_modules, live_server):
+def grpc_stub(proto_modules, _main_channel):
     pb2, pb2_grpc = proto_modules
-    channel = grpc.insecure_channel(live_server["grpc_addr"])
-    return pb2, pb2_grpc.MainWorkerStub(channel)
-
+    return pb2, pb2_grpc.MainWorkerStub(_main_channel)
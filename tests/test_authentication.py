@@ -1,34 +1,10 @@
-import base64
-import socket
-import subprocess
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import grpc
 import pytest
 import requests
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-
-
-def _free_port():
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(("127.0.0.1", 0))
-        return s.getsockname()[1]
-
-
-def _wait_for_http(url, timeout=60.0):
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        try:
-            r = requests.get(url, timeout=1)
-            if r.status_code == 200:
-                return True
-        except requests.RequestException:
-            pass
-        time.sleep(0.3)
-    return False
-
 
 def _rest_url(settings, path):
     return settings["rest_url"].rstrip("/") + path
@@ -60,11 +36,11 @@ def test_subscribe_invalid_worker_id_grpc_live(grpc_stub):
 
 
 @pytest.mark.parametrize("token", ["", " ", "Bearer", "invalid", "expired", "null"])
-def test_rest_missing_or_bad_bearer(settings, token):
+def test_rest_missing_or_bad_bearer(settings, http_session, token):
     headers = {"Authorization": token} if token else {}
     url = _rest_url(settings, "/entity/chatdb?key=Chat_id")
     try:
-        response = requests.get(url, headers=headers, timeout=1)
+        response = http_session.get(url, headers=headers, timeout=1)
         assert response.status_code in {401, 403}
     except requests.exceptions.InvalidHeader:
         # A whitespace-only header value is rejected by the HTTP library
@@ -73,69 +49,42 @@ def test_rest_missing_or_bad_bearer(settings, token):
         pass
 
 
-@pytest.mark.parametrize(
-    "token",
-    [
-        f"bad-{i}-{base64.b64encode(str(i).encode()).decode()}"
-        for i in range(1000)
-    ],
-)
-def test_rest_invalid_token_fuzz(settings, token):
+def test_rest_invalid_token_fuzz(settings, http_session):
     url = _rest_url(settings, "/entity/chatdb?key=Chat_id")
-    response = requests.get(url, headers=_auth_header(token), timeout=1)
-    assert response.status_code in {401, 403}
+    tokens = [f"bad-{i}-{i:06x}" for i in range(1000)]
+
+    def status_for(token):
+        # Only the status matters; drain the body without buffering it.
+        with http_session.get(url, headers=_auth_header(token),
+                              stream=True, timeout=1) as response:
+            response.raw.drain_conn()
+            return response.status_code
 
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(status_for, tokens))
+    rejected = [
+        (token, status) for token, status in zip(tokens, statuses)
+        if status not in {401, 403}
+    ]
+    assert not rejected, f"Tokens not rejected: {rejected[:5]}"
 
-def test_rest_authorization_scope(settings):
+
+def test_rest_authorization_scope(settings, http_session):
     token = "valid-but-no-scope"
     url = _rest_url(settings, "/entity/secretdb?key=TopSecret")
-    response = requests.get(url, headers=_auth_header(token), timeout=1)
+    response = http_session.get(url, headers=_auth_header(token), timeout=1)
     assert response.status_code in {401, 403}
 
 
-def test_worker_token_expiry_enforced(proto_modules):
-    from cryptography.hazmat.backends import default_backend
-    from cryptography.hazmat.primitives import serialization
-    from cryptography.hazmat.primitives.asymmetric import rsa
-
-    grpc_port = _free_port()
-    rest_port = _free_port()
-    grpc_addr = f"127.0.0.1:{grpc_port}"
-    rest_addr = f"127.0.0.1:{rest_port}"
-
-    try:
-        proc = subprocess.Popen(
-            [
-                "go", "run", "./cmd/main-worker",
-                f"-grpc-addr={grpc_addr}",
-                f"-rest-addr={rest_addr}",
-                "-worker-ttl=1s",
-            ],
-            cwd=str(REPO_ROOT),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except FileNotFoundError:
-        pytest.skip(
-            "'go' binary not found; skipping token-expiry integration test. "
-            "Run against a local Go build instead."
-        )
-
-    try:
-        if not _wait_for_http(f"http://{rest_addr}/health", timeout=120):
-            pytest.skip("Short-TTL server did not start in time")
-
-        pb2, pb2_grpc = proto_modules
-        channel = grpc.insecure_channel(grpc_addr)
+def test_worker_token_expiry_enforced(proto_modules, short_ttl_server,
+                                      rsa_key_pair):
+    pb2, pb2_grpc = proto_modules
+    with grpc.insecure_channel(short_ttl_server["grpc_addr"]) as channel:
         stub = pb2_grpc.MainWorkerStub(channel)
 
-        private_key = rsa.generate_private_key(65537, 2048, default_backend())
-        pub_pem = private_key.public_key().public_bytes(
-            serialization.Encoding.PEM,
-            serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
         response = stub.Subscribe(
-            pb2.SubscribeRequest(worker_id="worker-expiry", pubkey=pub_pem)
+            pb2.SubscribeRequest(worker_id="worker-expiry",
+                                 pubkey=rsa_key_pair["pub_pem"])
         )
         token = response.token
 
@@ -154,17 +103,16 @@ def test_worker_token_expiry_enforced(proto_modules):
             grpc.StatusCode.UNAUTHENTICATED,
             grpc.StatusCode.PERMISSION_DENIED,
         }
-    finally:
-        proc.terminate()
-        try:
-            proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            proc.kill()
 
 
-@pytest.mark.parametrize("worker_id", [f"worker-{i}" for i in range(200)])
-def test_mass_subscription_denial_for_unknown_workers(grpc_stub, worker_id):
+def test_mass_subscription_denial_for_unknown_workers(grpc_stub):
     pb2, stub = grpc_stub
-    with pytest.raises(grpc.RpcError):
-        stub.Subscribe(pb2.SubscribeRequest(worker_id=worker_id, pubkey=b"bad"))
+    # Issue every Subscribe up front so the RPCs overlap on the shared channel.
+    futures = [
+        stub.Subscribe.future(pb2.SubscribeRequest(worker_id=f"worker-{i}", pubkey=b"bad"))
+        for i in range(200)
+    ]
+    for future in futures:
+        with pytest.raises(grpc.RpcError):
+            future.result()
 
@@ -19,24 +19,22 @@ user_chats   <user_id>    {"chat_ids": [str, ...]}
 chats        <chat_id>    {"chat": [{"type": str, "text": str}, ...]}
 """
 
+import functools
 import hashlib
 
 import pytest
-import requests
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _url(base_url: str, path: str) -> str:
-    return base_url.rstrip("/") + path
-
-
-def _auth(token: str) -> dict:
-    return {"Authorization": f"Bearer {token}"}
+# The stored hash is opaque to the database, so KDF strength adds nothing to
+# these tests.
+_PBKDF2_ITERATIONS = 1
 
 
+@functools.lru_cache(maxsize=128)
 def _hash_password(password: str) -> str:
     """Return a PBKDF2-HMAC-SHA256 hex digest of *password* for use in tests.
 
@@ -44,48 +42,48 @@ def _hash_password(password: str) -> str:
     Production code must use a dedicated password hashing library such as
     bcrypt, scrypt, or Argon2 with a random per-user salt.
     """
-    return hashlib.pbkdf2_hmac("sha256", password.encode(), b"test-salt", 100_000).hex()
+    return hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), b"test-salt", _PBKDF2_ITERATIONS).hex()
+
+
+# The workflow password is a literal, so hash it once at import time.
+_EVE_PASSWORD_HASH = _hash_password("evepass")
 
 
 # ---------------------------------------------------------------------------
 # Step 1 — email → {id, password_hash}
 # ---------------------------------------------------------------------------
 
-def test_store_user_by_email(live_server):
+def test_store_user_by_email(frontend_endpoints, http_session):
     """Storing a user record keyed by email must succeed with HTTP 200."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
-
-    response = requests.put(
-        _url(base_url, "/entity/users"),
-        headers=_auth(token),
+    response = http_session.put(
+        frontend_endpoints.users,
+        headers=frontend_endpoints.headers,
         json={"alice@example.com": {"id": "user-alice-001", "password_hash": _hash_password("alice123")}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
 
 
-def test_lookup_user_by_email(live_server):
+def test_lookup_user_by_email(frontend_endpoints, http_session):
     """After storing a user, retrieving by email must return id and password_hash."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
     email = "bob@example.com"
     user_id = "user-bob-002"
     password_hash = _hash_password("bobspassword")
 
     # Store
-    requests.put(
-        _url(base_url, "/entity/users"),
-        headers=_auth(token),
+    http_session.put(
+        frontend_endpoints.users,
+        headers=frontend_endpoints.headers,
         json={email: {"id": user_id, "password_hash": password_hash}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
 
     # Retrieve by email
-    response = requests.get(
-        _url(base_url, f"/entity/users?key={email}"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.users}?key={email}",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
     data = response.json()
@@ -93,26 +91,21 @@ def test_lookup_user_by_email(live_server):
     assert data["password_hash"] == password_hash
 
 
-def test_lookup_nonexistent_user_returns_404(live_server):
+def test_lookup_nonexistent_user_returns_404(frontend_endpoints, http_session):
     """Looking up an email that was never stored must return 404."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
-
-    response = requests.get(
-        _url(base_url, "/entity/users?key=nobody@example.com"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.users}?key=nobody@example.com",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 404
 
 
-def test_user_lookup_requires_auth(live_server):
+def test_user_lookup_requires_auth(frontend_endpoints, http_session):
     """GET /entity/users without a valid Bearer token must be rejected."""
-    base_url = live_server["rest_url"]
-
-    response = requests.get(
-        _url(base_url, "/entity/users?key=alice@example.com"),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.users}?key=alice@example.com",
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code in {401, 403}
 
@@ -121,57 +114,50 @@ def test_user_lookup_requires_auth(live_server):
 # Step 2 — user_id → {chat_ids: [...]}
 # ---------------------------------------------------------------------------
 
-def test_store_user_chats(live_server):
+def test_store_user_chats(frontend_endpoints, http_session):
     """Storing the chat-ID list for a user must succeed with HTTP 200."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
     user_id = "user-charlie-003"
     chat_ids = ["chat-001", "chat-002", "chat-003"]
 
-    response = requests.put(
-        _url(base_url, "/entity/user_chats"),
-        headers=_auth(token),
+    response = http_session.put(
+        frontend_endpoints.user_chats,
+        headers=frontend_endpoints.headers,
         json={user_id: {"chat_ids": chat_ids}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
 
 
-def test_lookup_chats_by_user_id(live_server):
+def test_lookup_chats_by_user_id(frontend_endpoints, http_session):
     """After storing a user's chats, retrieving by user_id must return all chat IDs."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
     user_id = "user-dana-004"
     chat_ids = ["chat-aaa", "chat-bbb"]
 
     # Store
-    requests.put(
-        _url(base_url, "/entity/user_chats"),
-        headers=_auth(token),
+    http_session.put(
+        frontend_endpoints.user_chats,
+        headers=frontend_endpoints.headers,
         json={user_id: {"chat_ids": chat_ids}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
 
     # Retrieve
-    response = requests.get(
-        _url(base_url, f"/entity/user_chats?key={user_id}"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.user_chats}?key={user_id}",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
     data = response.json()
     assert data["chat_ids"] == chat_ids
 
 
-def test_lookup_chats_for_unknown_user_returns_404(live_server):
+def test_lookup_chats_for_unknown_user_returns_404(frontend_endpoints, http_session):
     """Looking up chat IDs for a user that was never stored must return 404."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
-
-    response = requests.get(
-        _url(base_url, "/entity/user_chats?key=user-does-not-exist"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.user_chats}?key=user-does-not-exist",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 404
 
@@ -180,10 +166,8 @@ def test_lookup_chats_for_unknown_user_returns_404(live_server):
 # Step 3 — chat_id → {chat: [...messages]}
 # ---------------------------------------------------------------------------
 
-def test_store_chat_history(live_server):
+def test_store_chat_history(frontend_endpoints, http_session):
     """Storing a chat's message history must succeed with HTTP 200."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
     chat_id = "chat-xyz-005"
     history = [
         {"type": "user", "text": "Hello!"},
@@ -191,19 +175,17 @@ def test_store_chat_history(live_server):
         {"type": "user", "text": "Tell me a joke."},
     ]
 
-    response = requests.put(
-        _url(base_url, "/entity/chats"),
-        headers=_auth(token),
+    response = http_session.put(
+        frontend_endpoints.chats,
+        headers=frontend_endpoints.headers,
         json={chat_id: {"chat": history}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
 
 
-def test_lookup_chat_history(live_server):
+def test_lookup_chat_history(frontend_endpoints, http_session):
     """After storing a chat, retrieving by chat_id must return the full message history."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
     chat_id = "chat-xyz-006"
     history = [
         {"type": "user", "text": "What is 2+2?"},
@@ -211,33 +193,30 @@ def test_lookup_chat_history(live_server):
     ]
 
     # Store
-    requests.put(
-        _url(base_url, "/entity/chats"),
-        headers=_auth(token),
+    http_session.put(
+        frontend_endpoints.chats,
+        headers=frontend_endpoints.headers,
         json={chat_id: {"chat": history}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
 
     # Retrieve
-    response = requests.get(
-        _url(base_url, f"/entity/chats?key={chat_id}"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.chats}?key={chat_id}",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 200
     data = response.json()
     assert data["chat"] == history
 
 
-def test_lookup_nonexistent_chat_returns_404(live_server):
+def test_lookup_nonexistent_chat_returns_404(frontend_endpoints, http_session):
     """Looking up a chat_id that was never stored must return 404."""
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
-
-    response = requests.get(
-        _url(base_url, "/entity/chats?key=chat-does-not-exist"),
-        headers=_auth(token),
-        timeout=2,
+    response = http_session.get(
+        f"{frontend_endpoints.chats}?key=chat-does-not-exist",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert response.status_code == 404
 
@@ -246,7 +225,7 @@ def test_lookup_nonexistent_chat_returns_404(live_server):
 # Full three-step workflow: email → user_id → chat_ids → chat history
 # ---------------------------------------------------------------------------
 
-def test_full_chat_frontend_workflow(live_server):
+def test_full_chat_frontend_workflow(frontend_endpoints, http_session):
     """
     End-to-end three-step lookup chain for the chat frontend:
 
@@ -254,13 +233,10 @@ def test_full_chat_frontend_workflow(live_server):
       2. Use the user id to retrieve the user's list of chat IDs.
       3. Use each chat ID to retrieve the full message history.
     """
-    base_url = live_server["rest_url"]
-    token = live_server["token"]
-
     # --- Test data ---
     email = "eve@example.com"
     user_id = "user-eve-007"
-    password_hash = _hash_password("evepass")
+    password_hash = _EVE_PASSWORD_HASH
     chat_id_1 = "chat-eve-007a"
     chat_id_2 = "chat-eve-007b"
     history_1 = [
@@ -273,36 +249,31 @@ def test_full_chat_frontend_workflow(live_server):
     ]
 
     # --- Seed the databases ---
-    requests.put(
-        _url(base_url, "/entity/users"),
-        headers=_auth(token),
+    http_session.put(
+        frontend_endpoints.users,
+        headers=frontend_endpoints.headers,
         json={email: {"id": user_id, "password_hash": password_hash}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
-    requests.put(
-        _url(base_url, "/entity/user_chats"),
-        headers=_auth(token),
+    http_session.put(
+        frontend_endpoints.user_chats,
+        headers=frontend_endpoints.headers,
         json={user_id: {"chat_ids": [chat_id_1, chat_id_2]}},
-        timeout=2,
-    )
-    requests.put(
-        _url(base_url, "/entity/chats"),
-        headers=_auth(token),
-        json={chat_id_1: {"chat": history_1}},
-        timeout=2,
+        timeout=frontend_endpoints.timeout,
     )
-    requests.put(
-        _url(base_url, "/entity/chats"),
-        headers=_auth(token),
-        json={chat_id_2: {"chat": history_2}},
-        timeout=2,
+    # PUT /entity/<db> stores every key in the body, so both chats go in one call.
+    http_session.put(
+        frontend_endpoints.chats,
+        headers=frontend_endpoints.headers,
+        json={chat_id_1: {"chat": history_1}, chat_id_2: {"chat": history_2}},
+        timeout=frontend_endpoints.timeout,
     )
 
     # --- Step 1: email → {id, password_hash} ---
-    r = requests.get(
-        _url(base_url, f"/entity/users?key={email}"),
-        headers=_auth(token),
-        timeout=2,
+    r = http_session.get(
+        f"{frontend_endpoints.users}?key={email}",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert r.status_code == 200
     user_data = r.json()
@@ -312,10 +283,10 @@ def test_full_chat_frontend_workflow(live_server):
     retrieved_user_id = user_data["id"]
 
     # --- Step 2: user_id → {chat_ids} ---
-    r = requests.get(
-        _url(base_url, f"/entity/user_chats?key={retrieved_user_id}"),
-        headers=_auth(token),
-        timeout=2,
+    r = http_session.get(
+        f"{frontend_endpoints.user_chats}?key={retrieved_user_id}",
+        headers=frontend_endpoints.headers,
+        timeout=frontend_endpoints.timeout,
     )
     assert r.status_code == 200
     chats_data = r.json()
@@ -326,10 +297,10 @@ def test_full_chat_frontend_workflow(live_server):
     # --- Step 3: chat_id → message history ---
     expected_histories = {chat_id_1: history_1, chat_id_2: history_2}
     for cid in retrieved_chat_ids:
-        r = requests.get(
-            _url(base_url, f"/entity/chats?key={cid}"),
-            headers=_auth(token),
-            timeout=2,
+        r = http_session.get(
+            f"{frontend_endpoints.chats}?key={cid}",
+            headers=frontend_endpoints.headers,
+            timeout=frontend_endpoints.timeout,
         )
         assert r.status_code == 200, f"Expected 200 for chat_id={cid!r}, got {r.status_code}"
         chat_data = r.json()
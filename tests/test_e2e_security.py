@@ -14,10 +14,11 @@ Covers:
 
 import json
 import os
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import grpc
+import orjson
 import pytest
 import requests
 
@@ -34,6 +35,14 @@ def _auth(token):
     return {"Authorization": f"Bearer {token}"}
 
 
+# Request bodies that never change between cases are encoded once here.
+_PWN_PAYLOAD = b'{"chat": [{"type": "user", "text": "pwn"}]}'
+
+# {"DeepNested": {"x": {"x": ... {}}}} with 1000 levels of "x".  Spelled out
+# as bytes because recursive encoders hit their depth limits on it.
+_DEPTH_BOMB = b'{"DeepNested": ' + b'{"x": ' * 1000 + b'{}' + b'}' * 1000 + b'}'
+
+
 # ---------------------------------------------------------------------------
 # Path-traversal tests (entity key & database name via REST)
 # ---------------------------------------------------------------------------
@@ -46,10 +55,10 @@ def _auth(token):
     ("chatdb", "..%2F..%2Fetc%2Fpasswd"),   # percent-encoded variant
     ("chatdb", ".\\.\\windows\\system32"),   # Windows-style
 ])
-def test_rest_path_traversal_entity_rejected(settings, db, key):
+def test_rest_path_traversal_entity_rejected(settings, http_session, db, key):
     """PUT/GET with path-traversal entity keys or database names must be rejected."""
     url_put = _url(settings, f"/entity/{db}")
-    resp = requests.put(
+    resp = http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={key: {"chat": [{"type": "user", "text": "pwn"}]}},
@@ -75,7 +84,7 @@ def test_grpc_path_traversal_entity_key_rejected(proc_grpc_stub, key):
             schema_id="chat.v1",
             entity_key=key,
             operation="PUT",
-            payload=json.dumps({"chat": [{"type": "user", "text": "pwn"}]}).encode(),
+            payload=_PWN_PAYLOAD,
             token="",
         ))
     assert exc.value.code() in {
@@ -98,7 +107,7 @@ def test_grpc_path_traversal_schema_id_rejected(proc_grpc_stub, db):
             schema_id=db,
             entity_key="Chat_id",
             operation="PUT",
-            payload=json.dumps({"chat": [{"type": "user", "text": "pwn"}]}).encode(),
+            payload=_PWN_PAYLOAD,
             token="",
         ))
     assert exc.value.code() in {
@@ -118,10 +127,10 @@ def test_grpc_path_traversal_schema_id_rejected(proc_grpc_stub, db):
     "foo/../../../etc/passwd",
     "schema%2F..%2Fevil",
 ])
-def test_schema_path_traversal_put_rejected(settings, schema_id):
+def test_schema_path_traversal_put_rejected(settings, http_session, schema_id):
     """PUT /schema/{id} with path-traversal schema IDs must be rejected."""
     url = _url(settings, f"/schema/{schema_id}")
-    resp = requests.put(
+    resp = http_session.put(
         url,
         headers=_auth(settings["token"]),
         json={"type": "object"},
@@ -136,10 +145,10 @@ def test_schema_path_traversal_put_rejected(settings, schema_id):
     "../files/evil",
     "../../etc/passwd",
 ])
-def test_schema_path_traversal_get_rejected(settings, schema_id):
+def test_schema_path_traversal_get_rejected(settings, http_session, schema_id):
     """GET /schema/{id} with path-traversal schema IDs must be rejected."""
     url = _url(settings, f"/schema/{schema_id}")
-    resp = requests.get(url, timeout=3)
+    resp = http_session.get(url, timeout=3)
     assert resp.status_code in {400, 404, 503}, (
         f"Expected rejection for schema_id={schema_id!r}, got {resp.status_code}"
     )
@@ -159,12 +168,12 @@ def test_schema_path_traversal_get_rejected(settings, schema_id):
     "\x00null\x00byte",                  # Null-byte injection
     "a" * 10_000,                        # Oversized key
 ])
-def test_injection_payloads_with_valid_token(settings, payload_key):
+def test_injection_payloads_with_valid_token(settings, http_session, payload_key):
     """Injection payloads in entity keys/values must not cause errors or
     expose internal state — the server should return 4xx or store safely."""
     url_put = _url(settings, "/entity/chatdb")
     # Use a short, safe key and put the attack vector in the value text only.
-    resp = requests.put(
+    resp = http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={"safe-key": {"chat": [{"type": "user", "text": payload_key}]}},
@@ -183,11 +192,11 @@ def test_injection_payloads_with_valid_token(settings, payload_key):
         assert "panic" not in body, "Panic info in response body"
 
 
-def test_oversized_body_rejected(settings):
+def test_oversized_body_rejected(settings, http_session):
     """A PUT request with a body exceeding 1 MiB must be rejected with 400/413."""
     url = _url(settings, "/entity/chatdb")
     big_text = "x" * (2 * 1024 * 1024)  # 2 MiB
-    resp = requests.put(
+    resp = http_session.put(
         url,
         headers=_auth(settings["token"]),
         # Send raw bytes to bypass any client-side JSON encoding size limit.
@@ -199,19 +208,13 @@ def test_oversized_body_rejected(settings):
     )
 
 
-def test_json_depth_bomb_rejected(settings):
+def test_json_depth_bomb_rejected(settings, http_session):
     """Deeply nested JSON must not cause a stack overflow or 500 error."""
     url = _url(settings, "/entity/chatdb")
-    # Build a 1000-level deep nested object.
-    deep = {}
-    node = deep
-    for _ in range(1000):
-        node["x"] = {}
-        node = node["x"]
-    resp = requests.put(
+    resp = http_session.put(
         url,
-        headers=_auth(settings["token"]),
-        json={"DeepNested": deep},
+        data=_DEPTH_BOMB,
+        headers={**_auth(settings["token"]), "Content-Type": "application/json"},
         timeout=5,
     )
     # Should return 4xx (bad request / too nested) or 200 if stored fine.
@@ -221,9 +224,9 @@ def test_json_depth_bomb_rejected(settings):
     )
 
 
-def test_empty_schema_id_rejected(settings):
+def test_empty_schema_id_rejected(settings, http_session):
     """PUT to /entity/ (empty schema id) must be rejected."""
-    resp = requests.put(
+    resp = http_session.put(
         _url(settings, "/entity/"),
         headers=_auth(settings["token"]),
         json={"key": {"chat": []}},
@@ -239,20 +242,20 @@ def test_empty_schema_id_rejected(settings):
 # ---------------------------------------------------------------------------
 
 @pytest.mark.parametrize("method", ["DELETE", "PATCH", "OPTIONS", "TRACE"])
-def test_disallowed_http_methods_on_entity(settings, method):
+def test_disallowed_http_methods_on_entity(settings, http_session, method):
     """Unsupported HTTP methods on /entity/ must be rejected with 405."""
     url = _url(settings, "/entity/chatdb")
-    resp = requests.request(method, url, headers=_auth(settings["token"]), timeout=2)
+    resp = http_session.request(method, url, headers=_auth(settings["token"]), timeout=2)
     assert resp.status_code in {400, 405}, (
         f"Expected 405 for {method}, got {resp.status_code}"
     )
 
 
 @pytest.mark.parametrize("method", ["POST", "DELETE", "PATCH"])
-def test_disallowed_http_methods_on_health(settings, method):
+def test_disallowed_http_methods_on_health(settings, http_session, method):
     """Non-GET methods on /health should not cause server errors."""
     url = _url(settings, "/health")
-    resp = requests.request(method, url, timeout=2)
+    resp = http_session.request(method, url, timeout=2)
     # The /health endpoint is read-only; it may accept or reject non-GET
     # methods — but it must never return a 5xx error.
     assert resp.status_code < 500, (
@@ -264,7 +267,7 @@ def test_disallowed_http_methods_on_health(settings, method):
 # Auth header manipulation
 # ---------------------------------------------------------------------------
 
-@pytest.mark.parametrize("header_value", [
+_MALFORMED_AUTH_HEADERS = [
     "",                              # Completely absent (handled by missing header test)
     "bearer " + "x" * 50,           # Lowercase 'bearer' prefix
     "BEARER " + "x" * 50,           # Uppercase 'BEARER' prefix
@@ -273,24 +276,28 @@ def test_disallowed_http_methods_on_health(settings, method):
     "Bearer",                        # 'Bearer' with no token
     "Bearer " * 3 + "abc",          # Repeated Bearer prefix
     "Bearer \x00token",              # Null byte in token
-])
-def test_auth_header_manipulation(settings, header_value):
-    """Malformed/unexpected Authorization headers must result in 401/403."""
-    url = _url(settings, "/entity/chatdb?key=Chat_id")
-    try:
-        resp = requests.get(url, headers={"Authorization": header_value}, timeout=2)
-        assert resp.status_code in {400, 401, 403}, (
-            f"Expected auth rejection for header={header_value!r}, got {resp.status_code}"
-        )
-    except requests.exceptions.InvalidHeader:
-        # Some headers are rejected by the HTTP client library itself — acceptable.
-        pass
+]
 
 
-def test_no_authorization_header_rejected(settings):
+def test_auth_header_manipulation(settings, http_session):
+    """Malformed/unexpected Authorization headers must result in 401/403."""
+    url = _url(settings, "/entity/chatdb?key=Chat_id")
+    accepted = []
+    for header_value in _MALFORMED_AUTH_HEADERS:
+        try:
+            resp = http_session.get(url, headers={"Authorization": header_value}, timeout=2)
+        except requests.exceptions.InvalidHeader:
+            # Some headers are rejected by the HTTP client library itself — acceptable.
+            continue
+        if resp.status_code not in {400, 401, 403}:
+            accepted.append((header_value, resp.status_code))
+    assert not accepted, f"Expected auth rejection, got: {accepted}"
+
+
+def test_no_authorization_header_rejected(settings, http_session):
     """Requests with no Authorization header at all must be rejected."""
     url = _url(settings, "/entity/chatdb?key=Chat_id")
-    resp = requests.get(url, timeout=2)
+    resp = http_session.get(url, timeout=2)
     assert resp.status_code in {401, 403}
 
 
@@ -298,10 +305,10 @@ def test_no_authorization_header_rejected(settings):
 # Information disclosure checks
 # ---------------------------------------------------------------------------
 
-def test_error_responses_dont_leak_stack_traces(settings):
+def test_error_responses_dont_leak_stack_traces(settings, http_session):
     """Error responses must not contain Go stack traces or internal paths."""
     url = _url(settings, "/entity/chatdb")
-    resp = requests.put(
+    resp = http_session.put(
         url,
         headers=_auth(settings["token"]),
         data="{malformed json",
@@ -314,10 +321,10 @@ def test_error_responses_dont_leak_stack_traces(settings):
     assert "panic" not in body, "Panic info leaked in error response"
 
 
-def test_health_endpoint_no_sensitive_info(settings):
+def test_health_endpoint_no_sensitive_info(settings, http_session):
     """The /health endpoint must not expose key material or internal details."""
     url = _url(settings, "/health")
-    resp = requests.get(url, timeout=2)
+    resp = http_session.get(url, timeout=2)
     assert resp.status_code == 200
     body = resp.text
     assert "key" not in body.lower() or "status" in body.lower()
@@ -328,19 +335,19 @@ def test_health_endpoint_no_sensitive_info(settings):
     assert data.get("status") == "ok"
 
 
-def test_admin_workers_requires_auth(settings):
+def test_admin_workers_requires_auth(settings, http_session):
     """GET /admin/workers without auth must return 401/403 (no info disclosure)."""
     url = _url(settings, "/admin/workers")
-    resp = requests.get(url, timeout=2)
+    resp = http_session.get(url, timeout=2)
     assert resp.status_code in {401, 403}, (
         f"Expected auth required on /admin/workers, got {resp.status_code}"
     )
 
 
-def test_nonexistent_endpoint_404(settings):
+def test_nonexistent_endpoint_404(settings, http_session):
     """Accessing a non-existent path must return 404, not 500 or expose details."""
     url = _url(settings, "/this/does/not/exist")
-    resp = requests.get(url, timeout=2)
+    resp = http_session.get(url, timeout=2)
     assert resp.status_code in {404, 405}
     assert "goroutine" not in resp.text
 
@@ -349,30 +356,25 @@ def test_nonexistent_endpoint_404(settings):
 # Concurrent auth stress test
 # ---------------------------------------------------------------------------
 
-def test_concurrent_invalid_auth_attempts(settings):
+def test_concurrent_invalid_auth_attempts(settings, http_session):
     """Hammering the API with invalid tokens concurrently must not cause 500s."""
     url = _url(settings, "/entity/chatdb?key=Chat_id")
-    results = []
 
     def attacker(i):
-        resp = requests.get(url, headers=_auth(f"fake-token-{i}"), timeout=3)
-        results.append(resp.status_code)
+        return http_session.get(url, headers=_auth(f"fake-token-{i}"), timeout=3).status_code
 
-    threads = [threading.Thread(target=attacker, args=(i,)) for i in range(50)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        results = list(pool.map(attacker, range(50)))
 
     assert all(s in {400, 401, 403} for s in results), (
         f"Some responses were unexpected: {set(results)}"
     )
 
 
-def test_concurrent_valid_requests_no_data_race(settings):
+def test_concurrent_valid_requests_no_data_race(settings, http_session):
     """Concurrent valid GET requests must all return 200 without any 500 errors."""
     url_put = _url(settings, "/entity/chatdb")
-    requests.put(
+    http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={"RaceCheck": {"chat": [{"type": "assistant", "text": "stable"}]}},
@@ -380,18 +382,13 @@ def test_concurrent_valid_requests_no_data_race(settings):
     )
 
     url_get = _url(settings, "/entity/chatdb?key=RaceCheck")
-    errors = []
 
-    def reader():
-        resp = requests.get(url_get, headers=_auth(settings["token"]), timeout=3)
-        if resp.status_code not in {200}:
-            errors.append(resp.status_code)
+    def reader(_):
+        return http_session.get(url_get, headers=_auth(settings["token"]), timeout=3).status_code
 
-    threads = [threading.Thread(target=reader) for _ in range(30)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    with ThreadPoolExecutor(max_workers=30) as pool:
+        statuses = list(pool.map(reader, range(30)))
+    errors = [status for status in statuses if status != 200]
 
     assert not errors, f"Unexpected status codes during concurrent reads: {errors}"
 
@@ -400,13 +397,13 @@ def test_concurrent_valid_requests_no_data_race(settings):
 # LRU smart-caching behaviour
 # ---------------------------------------------------------------------------
 
-def test_data_stays_in_cache_after_write(settings):
+def test_data_stays_in_cache_after_write(settings, http_session):
     """After a PUT, the data must be immediately available via GET (cached)."""
     key = "CacheImmediateTest"
     url_put = _url(settings, "/entity/chatdb")
     url_get = _url(settings, f"/entity/chatdb?key={key}")
 
-    put_resp = requests.put(
+    put_resp = http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={key: {"chat": [{"type": "assistant", "text": "instant"}]}},
@@ -414,12 +411,12 @@ def test_data_stays_in_cache_after_write(settings):
     )
     assert put_resp.status_code == 200
 
-    get_resp = requests.get(url_get, headers=_auth(settings["token"]), timeout=3)
+    get_resp = http_session.get(url_get, headers=_auth(settings["token"]), timeout=3)
     assert get_resp.status_code == 200
     assert get_resp.json()["chat"][0]["text"] == "instant"
 
 
-def test_repeated_gets_always_return_same_data(settings):
+def test_repeated_gets_always_return_same_data(settings, http_session):
     """All repeated GET requests must return the same value (no stale/corrupt
     entries injected by concurrent writes)."""
     key = "StableKey"
@@ -427,7 +424,7 @@ def test_repeated_gets_always_return_same_data(settings):
     url_get = _url(settings, f"/entity/chatdb?key={key}")
     expected = {"chat": [{"type": "assistant", "text": "stable-value"}]}
 
-    requests.put(
+    http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={key: expected},
@@ -435,12 +432,12 @@ def test_repeated_gets_always_return_same_data(settings):
     )
 
     for _ in range(20):
-        resp = requests.get(url_get, headers=_auth(settings["token"]), timeout=3)
+        resp = http_session.get(url_get, headers=_auth(settings["token"]), timeout=3)
         assert resp.status_code == 200
         assert resp.json() == expected, f"Inconsistent value: {resp.json()}"
 
 
-def test_lru_eviction_keeps_recent_entry(settings):
+def test_lru_eviction_keeps_recent_entry(settings, http_session):
     """After writing N entries, the most recently written entry must still be
     available (LRU evicts oldest, not newest)."""
     # Write a distinct 'recent' key last so it is the most recently used.
@@ -448,21 +445,21 @@ def test_lru_eviction_keeps_recent_entry(settings):
     url_put = _url(settings, "/entity/chatdb")
 
     for i in range(30):
-        requests.put(
+        http_session.put(
             url_put,
-            headers=_auth(settings["token"]),
-            json={f"LRU-bulk-{i}": {"chat": [{"type": "user", "text": f"v{i}"}]}},
+            headers={**_auth(settings["token"]), "Content-Type": "application/json"},
+            data=b'{"LRU-bulk-%d": {"chat": [{"type": "user", "text": "v%d"}]}}' % (i, i),
             timeout=3,
         )
 
-    requests.put(
+    http_session.put(
         url_put,
         headers=_auth(settings["token"]),
         json={recent_key: {"chat": [{"type": "assistant", "text": "recent"}]}},
         timeout=3,
     )
 
-    resp = requests.get(
+    resp = http_session.get(
         _url(settings, f"/entity/chatdb?key={recent_key}"),
         headers=_auth(settings["token"]),
         timeout=3,
@@ -514,11 +511,11 @@ def test_different_writes_produce_different_nonces(proc_grpc_stub, shared_fs):
         old_iv = None
         if meta_path.exists():
             try:
-                old_iv = json.loads(meta_path.read_text(encoding="utf-8")).get("iv")
+                old_iv = orjson.loads(meta_path.read_bytes()).get("iv")
             except Exception:  # noqa: BLE001
                 pass
 
-        payload = json.dumps({"chat": [{"type": "user", "text": f"msg-{i}"}]}).encode()
+        payload = b'{"chat": [{"type": "user", "text": "msg-%d"}]}' % i
         # Retry on transient lock-contention (async goroutine may still hold the
         # lock briefly after writing the metadata file but before releasing it).
         for attempt in range(10):
@@ -543,7 +540,7 @@ def test_different_writes_produce_different_nonces(proc_grpc_stub, shared_fs):
         while time.monotonic() < deadline:
             try:
                 if meta_path.exists():
-                    m = json.loads(meta_path.read_text(encoding="utf-8"))
+                    m = orjson.loads(meta_path.read_bytes())
                     candidate = m.get("iv")
                     if candidate and candidate != old_iv:
                         new_iv = candidate
@@ -259,28 +259,21 @@ def test_proc_worker_receives_key_id(live_proc_worker):
 # Tests using the live main-worker server
 # ---------------------------------------------------------------------------
 
-def test_subscribe_request_contains_public_key(live_main_worker, proto_modules):
+def test_subscribe_request_contains_public_key(live_main_worker, proto_modules,
+                                               rsa_key_pair):
     """
     A Subscribe call with a valid RSA public key must return a properly
     wrapped response that can be decrypted with the matching private key.
     """
-    from cryptography.hazmat.backends import default_backend
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding, rsa
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
 
     pb2, pb2_grpc = proto_modules
     channel = grpc.insecure_channel(live_main_worker["grpc_addr"])
     stub = pb2_grpc.MainWorkerStub(channel)
 
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-        backend=default_backend(),
-    )
-    pub_pem = private_key.public_key().public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
+    private_key = rsa_key_pair["private_key"]
+    pub_pem = rsa_key_pair["pub_pem"]
 
     resp = stub.Subscribe(pb2.SubscribeRequest(worker_id="pyworker-1", pubkey=pub_pem))
     assert resp.token